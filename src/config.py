@@ -60,6 +60,7 @@ class ActionEnvironment(BaseSettings):
     base_branch: str = Field(alias="GITHUB_REF")
     event_name: str
     workspace: str
+    runner_debug: bool = Field(alias="RUNNER_DEBUG", default=False)
 
     model_config = SettingsConfigDict(
         case_sensitive=False, frozen=True, env_prefix="GITHUB_"
@@ -96,6 +97,7 @@ class Configuration(BaseSettings):
     pull_request_team_reviewers: frozenset[str] = Field(default_factory=frozenset)
     pull_request_labels: frozenset[str] = Field(default_factory=frozenset)
     extra_workflow_locations: frozenset[str] = Field(default_factory=frozenset)
+    release_cache_file: str = ""
     model_config = SettingsConfigDict(
         case_sensitive=False, frozen=True, env_prefix="INPUT_"
     )
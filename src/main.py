@@ -1,10 +1,14 @@
+import os
 import re
-from collections.abc import Generator
-from functools import cache, cached_property
-from typing import Any
+import shutil
+import threading
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from functools import cache, cached_property, partial
+from operator import attrgetter
+from typing import Any, NamedTuple
 
 import github_action_utils as gha_utils  # type: ignore
-import requests
 import yaml
 from packaging.version import Version, parse, InvalidVersion
 
@@ -21,26 +25,91 @@ from src.utils import (
     add_pull_request_labels,
     add_pull_request_reviewers,
     create_pull_request,
+    create_request_session,
     display_whats_new,
-    get_request_headers,
+    load_json_cache,
+    save_json_cache,
 )
 
+# Use LibYAML bindings when available, they are much faster
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+# Matches block style `uses: <action>` lines, e.g. `- uses: "actions/checkout@v4"`
+_ACTION_LINE_RE = re.compile(
+    r"""^[ \t]*(?:-[ \t]+)?uses:[ \t]*["']?([^"'\s#]+)""", re.MULTILINE
+)
+# Matches YAML that `_ACTION_LINE_RE` can not handle: anchors, aliases,
+# merge keys, flow mappings, quoted keys and values on the next line
+_COMPLEX_YAML_RE = re.compile(
+    r"""(?:^|[\s\[,])[&*][\w-]|<<[ \t]*:|[{,][ \t]*["']?uses|["']uses["'][ \t]*:"""
+    r"""|^[ \t]*(?:-[ \t]+)?uses:[ \t]*(?:#.*)?$""",
+    re.MULTILINE,
+)
+# Matches lines that start a literal or folded block scalar e.g. `run: |`
+_BLOCK_SCALAR_RE = re.compile(r"(?:^|[ \t])[|>][-+0-9]*[ \t]*(?:#.*)?$")
+# Matches lines whose quoted value continues on the next line e.g. `run: "echo`
+_UNCLOSED_QUOTE_RE = re.compile(
+    r"""^[ \t]*(?:-[ \t]+)*"""
+    r"""(?:(?:[^\s"'#][^:]*?|"(?:[^"\\]|\\.)*"|'(?:[^']|'')*'):[ \t]+)?"""
+    r"""(?:"(?:[^"\\]|\\.)*|'(?:[^']|'')*)$"""
+)
+# Top-level workflow and action metadata keys that can not contain actions
+_NON_ACTION_KEYS = frozenset(
+    [
+        "name",
+        "run-name",
+        "description",
+        "on",
+        "inputs",
+        "outputs",
+        "env",
+        "defaults",
+        "permissions",
+        "concurrency",
+        "branding",
+    ]
+)
+
+LogMessage = tuple[Callable[[str], None], str]
+
+
+class GitHubRelease(NamedTuple):
+    """A GitHub release of an action"""
+
+    tag_name: str
+    html_url: str
+    published_at: str
+    tag_name_parsed: Version
+
 
 class GitHubActionsVersionUpdater:
     """Check for GitHub Action updates"""
 
     github_api_url = "https://api.github.com"
+    github_graphql_url = "https://api.github.com/graphql"
     github_url = "https://github.com/"
     workflow_action_key = "uses"
+    max_workers = 16
+    graphql_batch_size = 50
 
     def __init__(self, env: ActionEnvironment, user_config: Configuration):
         self.env = env
         self.user_config = user_config
+        self.session = create_request_session(
+            user_config.token,
+            self.max_workers,
+            log_rate_limit=partial(self._log, gha_utils.warning),
+        )
+        self.release_cache = load_json_cache(user_config.release_cache_file)
+        self.prefetched_releases: dict[str, list[dict[str, str]]] = {}
+        # Messages logged by worker threads, these are printed later
+        # by the main thread inside the group of the workflow that uses them
+        self.deferred_messages: dict[tuple[str, ...], list[LogMessage]] = {}
+        self._thread_state = threading.local()
 
     def run(self) -> None:
         """Entrypoint to the GitHub Action"""
         workflow_paths = self._get_workflow_paths()
-        updated_item_markdown_set: set[str] = set()
+        updated_item_markdown_lines: list[str] = []
 
         if not workflow_paths:
             gha_utils.warning(
@@ -54,15 +123,44 @@ class GitHubActionsVersionUpdater:
                 f'Actions "{self.user_config.ignore_actions}" will be skipped'
             )
 
-        for workflow_path in workflow_paths:
-            updated_item_markdown_set = updated_item_markdown_set.union(
-                self._update_workflow(workflow_path)
+        workflows: dict[str, tuple[str, set[str]]] = {}
+
+        for workflow_path in sorted(workflow_paths):
+            workflow = self._read_workflow(workflow_path)
+
+            if workflow is not None:
+                workflows[workflow_path] = workflow
+
+        # Split every action used in the workflows only once
+        parsed_actions = {
+            action: self._parse_action(action)
+            for _, all_actions in workflows.values()
+            for action in all_actions
+        }
+        self._prefetch_new_versions(parsed_actions)
+
+        pending_writes: dict[str, str] = {}
+
+        for workflow_path, (file_data, all_actions) in workflows.items():
+            updated_items, updated_workflow_data = self._update_workflow(
+                workflow_path, file_data, all_actions, parsed_actions
             )
+            updated_item_markdown_lines.extend(updated_items)
+
+            if updated_workflow_data is not None:
+                pending_writes[workflow_path] = updated_workflow_data
 
-        if git_has_changes():
+        for workflow_path, updated_workflow_data in pending_writes.items():
+            self._write_workflow(workflow_path, updated_workflow_data)
+
+        save_json_cache(self.user_config.release_cache_file, self.release_cache)
+
+        if git_has_changes(self._git_excluded_paths):
             # Use timestamp to ensure uniqueness of the new branch
             pull_request_body = "### GitHub Actions Version Updates\n" + "".join(
-                updated_item_markdown_set
+                # The same action can be updated in multiple workflows,
+                # remove duplicate lines while keeping the order
+                dict.fromkeys(updated_item_markdown_lines)
             )
             gha_utils.append_job_summary(pull_request_body)
 
@@ -75,6 +173,7 @@ class GitHubActionsVersionUpdater:
                     self.user_config.git_commit_author,
                     self.user_config.pull_request_branch,
                     self.user_config.force_push,
+                    self._git_excluded_paths,
                 )
                 pull_request_number = create_pull_request(
                     self.user_config.pull_request_title,
@@ -100,7 +199,7 @@ class GitHubActionsVersionUpdater:
                         self.user_config.token,
                     )
             else:
-                add_git_diff_to_job_summary()
+                add_git_diff_to_job_summary(self._git_excluded_paths)
                 gha_utils.error(
                     "Updates found but skipping pull request. "
                     "Checkout build summary for update details."
@@ -109,83 +208,303 @@ class GitHubActionsVersionUpdater:
         else:
             gha_utils.notice("Everything is up-to-date! \U0001F389 \U0001F389")
 
-    def _update_workflow(self, workflow_path: str) -> set[str]:
-        """Update the workflow file with the updated data"""
-        updated_item_markdown_set: set[str] = set()
+    @cached_property
+    def _git_excluded_paths(self) -> tuple[str, ...]:
+        """Files written by the action that must never be committed"""
+        if not self.user_config.release_cache_file:
+            return ()
+
+        # git pathspecs are relative to the current directory
+        cache_file = os.path.relpath(self.user_config.release_cache_file)
 
+        if cache_file.startswith(os.pardir):
+            # The cache file is outside the repository
+            return ()
+
+        return (cache_file,)
+
+    def _read_workflow(self, workflow_path: str) -> tuple[str, set[str]] | None:
+        """Read the workflow file and get all actions used in it"""
         try:
-            with open(workflow_path, "r+") as file, gha_utils.group(
-                f'Checking "{workflow_path}" for updates'
-            ):
+            with open(workflow_path) as file:
                 file_data = file.read()
-                updated_workflow_data = file_data
-
-                try:
-                    workflow_data = yaml.load(file_data, Loader=yaml.FullLoader)
-                except yaml.YAMLError as exc:
-                    gha_utils.error(
-                        f"Error while parsing YAML from '{workflow_path}' file. "
-                        f"Reason: {exc}"
+        except FileNotFoundError:
+            gha_utils.warning(f"Workflow file '{workflow_path}' not found")
+            return None
+
+        if self.workflow_action_key not in file_data:
+            # Skip parsing workflows that can not contain any action
+            return file_data, set()
+
+        try:
+            all_actions = self._get_all_actions(file_data)
+        except yaml.YAMLError as exc:
+            gha_utils.error(
+                f"Error while parsing YAML from '{workflow_path}' file. "
+                f"Reason: {exc}"
+            )
+            return None
+
+        # Remove ignored actions
+        all_actions.difference_update(self.user_config.ignore_actions)
+
+        return file_data, all_actions
+
+    def _parse_action(self, action: str) -> tuple[str, str, str] | None:
+        """Split an action into its location, repository and version"""
+        try:
+            action_location, current_version = action.split("@")
+        except ValueError:
+            return None
+
+        # A GitHub Action can be in a subdirectory of a repository
+        # e.g. `flatpak/flatpak-github-actions/flatpak-builder@v4`.
+        # we only need `user/repo` part from action_repository
+        action_repository = "/".join(action_location.split("/")[:2])
+        return action_location, action_repository, current_version
+
+    def _prefetch_new_versions(
+        self, parsed_actions: dict[str, tuple[str, str, str] | None]
+    ) -> None:
+        """Fetch new versions of all actions concurrently to populate the cache"""
+        action_versions = sorted(
+            {
+                (parsed_action[1], parsed_action[2])
+                for parsed_action in parsed_actions.values()
+                if parsed_action is not None
+            }
+        )
+
+        if not action_versions:
+            return
+
+        unique_repositories = sorted({repository for repository, _ in action_versions})
+        get_repository_data: Callable[[str], Any]
+
+        if (
+            self.user_config.update_version_with
+            == UpdateVersionWith.DEFAULT_BRANCH_COMMIT_SHA
+        ):
+            get_repository_data = self._get_default_branch_name
+        else:
+            # GraphQL API responses have no `ETag`. When releases are cached,
+            # all of them are fetched using conditional REST API requests instead,
+            # so that they can be revalidated for free on the next run
+            if not self.user_config.release_cache_file:
+                self._prefetch_github_releases(set(unique_repositories))
+
+            get_repository_data = self._get_github_releases
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            # Fetch the data of each repository once before checking the versions,
+            # so that actions used with different versions share the same requests.
+            repository_messages = executor.map(
+                partial(self._call_deferring_messages, get_repository_data),
+                unique_repositories,
+            )
+
+            for action_repository, messages in zip(
+                unique_repositories, repository_messages
+            ):
+                self.deferred_messages[(action_repository,)] = messages
+
+            version_messages = executor.map(
+                lambda action_version: self._call_deferring_messages(
+                    self._get_new_version, *action_version
+                ),
+                action_versions,
+            )
+
+            for action_version, messages in zip(action_versions, version_messages):
+                self.deferred_messages[action_version] = messages
+
+    def _log(self, log_function: Callable[[str], None], message: str) -> None:
+        """Log a message or defer it if it is logged by a worker thread"""
+        messages = getattr(self._thread_state, "messages", None)
+
+        if messages is None:
+            log_function(message)
+        else:
+            messages.append((log_function, message))
+
+    def _call_deferring_messages(
+        self, function: Callable[..., Any], *args: Any
+    ) -> list[LogMessage]:
+        """Call the function and return the messages it logged"""
+        self._thread_state.messages = []
+
+        try:
+            function(*args)
+            return self._thread_state.messages
+        finally:
+            self._thread_state.messages = None
+
+    def _print_deferred_messages(self, key: tuple[str, ...]) -> None:
+        """Print the messages logged by worker threads for the key"""
+        for log_function, message in self.deferred_messages.pop(key, []):
+            log_function(message)
+
+    def _prefetch_github_releases(self, action_repositories: set[str]) -> None:
+        """Get GitHub releases for multiple actions using GitHub GraphQL API"""
+        repositories = sorted(action_repositories)
+
+        for index in range(0, len(repositories), self.graphql_batch_size):
+            batch = repositories[index : index + self.graphql_batch_size]
+            variables: dict[str, str] = {}
+            variable_definitions = []
+            fields = []
+
+            for alias_index, action_repository in enumerate(batch):
+                owner, _, name = action_repository.partition("/")
+                variables[f"owner{alias_index}"] = owner
+                variables[f"name{alias_index}"] = name
+                variable_definitions.append(
+                    f"$owner{alias_index}: String!, $name{alias_index}: String!"
+                )
+                fields.append(
+                    f"r{alias_index}: repository("
+                    f"owner: $owner{alias_index}, name: $name{alias_index}) {{ "
+                    "releases(first: 50, "
+                    "orderBy: {field: CREATED_AT, direction: DESC}) { "
+                    "nodes { tagName publishedAt url isPrerelease } } }"
+                )
+
+            query = f"query({', '.join(variable_definitions)}) {{ {' '.join(fields)} }}"
+            response = self.session.post(
+                self.github_graphql_url,
+                json={"query": query, "variables": variables},
+            )
+
+            if response.status_code != 200:
+                gha_utils.notice(
+                    "Could not get releases using GitHub GraphQL API, "
+                    f"GitHub API Response: {response.text}"
+                )
+                return
+
+            response_data = response.json().get("data") or {}
+
+            for alias_index, action_repository in enumerate(batch):
+                repository_data = response_data.get(f"r{alias_index}")
+
+                # Private or missing repositories are fetched using REST API later
+                if not repository_data or not repository_data["releases"]["nodes"]:
+                    continue
+
+                self.prefetched_releases[action_repository] = [
+                    {
+                        "published_at": release["publishedAt"],
+                        "html_url": release["url"],
+                        "tag_name": release["tagName"],
+                    }
+                    for release in repository_data["releases"]["nodes"]
+                    if not release["isPrerelease"]
+                ]
+
+    def _update_workflow(
+        self,
+        workflow_path: str,
+        file_data: str,
+        all_actions: set[str],
+        parsed_actions: dict[str, tuple[str, str, str] | None],
+    ) -> tuple[list[str], str | None]:
+        """Get the updated workflow data and pull request body lines"""
+        updated_actions: dict[str, str] = {}
+        updated_item_markdown: dict[str, str] = {}
+        # Print the status of all actions at once instead of line by line
+        status_lines: list[str] = []
+
+        with gha_utils.group(f'Checking "{workflow_path}" for updates'):
+            for action in sorted(all_actions):
+                parsed_action = parsed_actions[action]
+
+                if parsed_action is None:
+                    gha_utils.notice(
+                        f'Action "{action}" is in an unsupported format. '
+                        "We only support community actions currently."
                     )
-                    return updated_item_markdown_set
-
-                all_actions = set(self._get_all_actions(workflow_data))
-                # Remove ignored actions
-                all_actions.difference_update(self.user_config.ignore_actions)
-
-                for action in all_actions:
-                    try:
-                        action_location, current_version = action.split("@")
-                        # A GitHub Action can be in a subdirectory of a repository
-                        # e.g. `flatpak/flatpak-github-actions/flatpak-builder@v4`.
-                        # we only need `user/repo` part from action_repository
-                        action_repository = "/".join(action_location.split("/")[:2])
-                    except ValueError:
-                        gha_utils.notice(
-                            f'Action "{action}" is in an unsupported format. '
-                            "We only support community actions currently."
-                        )
-                        continue
+                    continue
 
-                    new_version, new_version_data = self._get_new_version(
-                        action_repository,
-                        current_version,
+                action_location, action_repository, current_version = parsed_action
+                self._print_deferred_messages((action_repository,))
+                self._print_deferred_messages((action_repository, current_version))
+
+                new_version, new_version_data = self._get_new_version(
+                    action_repository,
+                    current_version,
+                )
+
+                if not new_version:
+                    gha_utils.notice(
+                        f"Could not find any new version for {action}. Skipping..."
                     )
+                    continue
+
+                updated_action = f"{action_location}@{new_version}"
 
-                    if not new_version:
-                        gha_utils.notice(
-                            f"Could not find any new version for {action}. Skipping..."
+                if action != updated_action:
+                    status_lines.append(f'Found new version for "{action_repository}"')
+                    updated_item_markdown[action] = (
+                        self._generate_updated_item_markdown(
+                            action_repository, new_version_data
                         )
-                        continue
+                    )
+                    status_lines.append(
+                        f'Updating "{action}" with "{updated_action}"...'
+                    )
+                    updated_actions[action] = updated_action
+                elif self.env.runner_debug:
+                    status_lines.append(f'No updates found for "{action_repository}"')
+
+            if status_lines:
+                gha_utils.echo("\n".join(status_lines))
+
+        if not updated_actions:
+            return [], None
+
+        # Replace all actions in a single pass. The lookarounds make sure
+        # that e.g. `foo/bar@v1` does not match inside `foo/bar@v10`
+        action_pattern = re.compile(
+            r"(?<![\w./-])("
+            + "|".join(map(re.escape, updated_actions))
+            + r")(?![\w./-])"
+        )
+        replaced_actions: set[str] = set()
 
-                    updated_action = f"{action_location}@{new_version}"
+        def replace_action(match: re.Match[str]) -> str:
+            replaced_actions.add(match.group(1))
+            return updated_actions[match.group(1)]
 
-                    if action != updated_action:
-                        gha_utils.echo(f'Found new version for "{action_repository}"')
-                        updated_item_markdown_set.add(
-                            self._generate_updated_item_markdown(
-                                action_repository, new_version_data
-                            )
-                        )
-                        gha_utils.echo(
-                            f'Updating "{action}" with "{updated_action}"...'
-                        )
-                        updated_workflow_data = re.sub(
-                            pattern=rf"({action})(\s+['\"]?|['\"]?$)",
-                            repl=rf"{updated_action}\2",
-                            string=updated_workflow_data,
-                            flags=re.MULTILINE,
-                        )
-                    else:
-                        gha_utils.echo(f'No updates found for "{action_repository}"')
+        updated_workflow_data = action_pattern.sub(replace_action, file_data)
 
-                if updated_item_markdown_set:
-                    file.seek(0)
-                    file.write(updated_workflow_data)
-                    file.truncate()
-        except FileNotFoundError:
-            gha_utils.warning(f"Workflow file '{workflow_path}' not found")
-        return updated_item_markdown_set
+        for action in updated_actions.keys() - replaced_actions:
+            gha_utils.notice(
+                f'Could not find "{action}" in "{workflow_path}" to update it'
+            )
+
+        # Only list the actions that were actually updated in the pull request body
+        updated_item_markdown_lines = [
+            markdown
+            for action, markdown in updated_item_markdown.items()
+            if action in replaced_actions
+        ]
+
+        if updated_workflow_data == file_data:
+            return [], None
+
+        return updated_item_markdown_lines, updated_workflow_data
+
+    def _write_workflow(self, workflow_path: str, workflow_data: str) -> None:
+        """Write the updated data to the workflow file"""
+        # Write to a temporary file first so that the workflow file
+        # is never left partially written
+        temporary_path = f"{workflow_path}.tmp"
+
+        with open(temporary_path, "w") as file:
+            file.write(workflow_data)
+
+        shutil.copymode(workflow_path, temporary_path)
+        os.replace(temporary_path, workflow_path)
 
     def _generate_updated_item_markdown(
         self, action_repository: str, version_data: dict[str, str]
@@ -227,15 +546,70 @@ class GitHubActionsVersionUpdater:
         version_parts = version_tag.split('-')
         return version_parts[0]
 
-    def _get_github_releases(self, action_repository: str) -> list[dict[str, Any]]:
-        """Get GitHub releases for an action"""
-        url = f"{self.github_api_url}/repos/{action_repository}/releases?per_page=50"
+    @cache
+    def _get_github_releases(self, action_repository: str) -> list[GitHubRelease]:
+        """Get GitHub releases for an action sorted by version"""
+        releases = self.prefetched_releases.get(action_repository)
+
+        if releases is None:
+            releases = self._get_github_releases_from_api(action_repository)
+
+        # Sort through the releases returned by GitHub API using tag_name
+        return sorted(
+            (
+                GitHubRelease(
+                    tag_name=release["tag_name"],
+                    html_url=release["html_url"],
+                    published_at=release["published_at"],
+                    tag_name_parsed=parse(self._clean_version_tag(release["tag_name"])),
+                )
+                for release in releases
+            ),
+            key=attrgetter("tag_name_parsed"),
+            reverse=True,
+        )
 
-        response = requests.get(
-            url, headers=get_request_headers(self.user_config.token)
+    @staticmethod
+    def _is_valid_release_cache_entry(cached_data: Any) -> bool:
+        """Check if a release cache entry has the shape written by this action"""
+        return (
+            isinstance(cached_data, dict)
+            and isinstance(cached_data.get("etag"), str)
+            and isinstance(cached_data.get("releases"), list)
+            and all(
+                isinstance(release, dict)
+                and all(
+                    isinstance(release.get(key), str)
+                    for key in ("published_at", "html_url", "tag_name")
+                )
+                for release in cached_data["releases"]
+            )
         )
 
-        if response.status_code == 200:
+    def _get_github_releases_from_api(
+        self, action_repository: str
+    ) -> list[dict[str, str]]:
+        """Get GitHub releases for an action using GitHub REST API"""
+        url = f"{self.github_api_url}/repos/{action_repository}/releases?per_page=50"
+        cached_data = self.release_cache.get(action_repository)
+        headers = {}
+
+        # Ignore cache entries that do not have the shape written by this action
+        if not self._is_valid_release_cache_entry(cached_data):
+            cached_data = None
+
+        if cached_data:
+            # GitHub does not count conditional requests
+            # that return `304 Not Modified` against the rate limit
+            headers["If-None-Match"] = cached_data["etag"]
+
+        response = self.session.get(url, headers=headers)
+        releases: list[dict[str, str]] | None = None
+
+        if response.status_code == 304 and cached_data:
+            releases = cached_data["releases"]
+
+        elif response.status_code == 200:
             response_data = response.json()
 
             if response_data:
@@ -244,23 +618,26 @@ class GitHubActionsVersionUpdater:
                         "published_at": release["published_at"],
                         "html_url": release["html_url"],
                         "tag_name": release["tag_name"],
-                        "tag_name_parsed": parse(self._clean_version_tag(release["tag_name"])),
                     }
                     for release in response_data
                     if not release["prerelease"]
                 ]
-                # Sort through the releases returned by GitHub API using tag_name
-                return sorted(
-                    releases,
-                    key=lambda r: r["tag_name_parsed"],
-                    reverse=True,
-                )
 
-        gha_utils.notice(
-            f"Could not find any release for "
-            f'"{action_repository}", GitHub API Response: {response.json()}'
-        )
-        return []
+                if response.headers.get("ETag"):
+                    self.release_cache[action_repository] = {
+                        "etag": response.headers["ETag"],
+                        "releases": releases,
+                    }
+
+        if releases is None:
+            self._log(
+                gha_utils.notice,
+                f"Could not find any release for "
+                f'"{action_repository}", GitHub API Response: {response.json()}',
+            )
+            return []
+
+        return releases
 
     @cached_property
     def _release_filter_function(self):
@@ -298,35 +675,38 @@ class GitHubActionsVersionUpdater:
 
     def _get_latest_version_release(
         self, action_repository: str, current_version: str
-    ) -> dict[str, str]:
+    ) -> GitHubRelease | None:
         """Get the latest release"""
         github_releases = self._get_github_releases(action_repository)
-        latest_release: dict[str, Any] = {}
+        latest_release: GitHubRelease | None = None
 
         if not github_releases:
             return latest_release
 
         # Check if current_version is a branch name (e.g. 'main', 'master')
         if current_version in ['main', 'master'] or not current_version.startswith('v'):
-            gha_utils.notice(
+            self._log(
+                gha_utils.notice,
                 f"Current version '{current_version}' appears to be a branch reference. "
-                "Using latest release for comparison."
+                "Using latest release for comparison.",
             )
             return github_releases[0]
 
         try:
             parsed_current_version: Version = parse(current_version)
         except InvalidVersion:
-            gha_utils.notice(
+            self._log(
+                gha_utils.notice,
                 f"Could not parse version '{current_version}' of '{action_repository}'. "
-                "Using latest release for comparison."
+                "Using latest release for comparison.",
             )
             return github_releases[0]
 
         if not parsed_current_version.release:
-            gha_utils.notice(
+            self._log(
+                gha_utils.notice,
                 f"Parsing failed for `{current_version}` of `{action_repository}`, "
-                "falling back to latest release."
+                "falling back to latest release.",
             )
             latest_release = github_releases[0]
         else:
@@ -334,29 +714,32 @@ class GitHubActionsVersionUpdater:
                 latest_release = next(
                     filter(
                         lambda r: self._release_filter_function(
-                            r["tag_name_parsed"], parsed_current_version
+                            r.tag_name_parsed, parsed_current_version
                         ),
                         github_releases,
                     ),
-                    {},
+                    None,
                 )
             except AttributeError:
                 latest_release = github_releases[0]
-                gha_utils.notice(
+                self._log(
+                    gha_utils.notice,
                     f"GitHub releases of `{action_repository}` does not follow "
                     "Semantic Versioning specification. This can yield unexpected results, "
-                    "please be careful while using the updates suggested by this action."
+                    "please be careful while using the updates suggested by this action.",
                 )
 
-            if not latest_release:
-                gha_utils.notice(
+            if latest_release is None:
+                self._log(
+                    gha_utils.notice,
                     f"No strict match found for `{current_version}` of "
-                    f"`{action_repository}`, using newest available release."
+                    f"`{action_repository}`, using newest available release.",
                 )
                 latest_release = github_releases[0]
 
         return latest_release
 
+    @cache
     def _get_commit_data(
         self, action_repository: str, tag_or_branch_name: str
     ) -> dict[str, str]:
@@ -366,9 +749,7 @@ class GitHubActionsVersionUpdater:
             f"/{action_repository}/commits?sha={tag_or_branch_name}"
         )
 
-        response = requests.get(
-            url, headers=get_request_headers(self.user_config.token)
-        )
+        response = self.session.get(url)
 
         if response.status_code == 200:
             response_data = response.json()[0]
@@ -379,26 +760,27 @@ class GitHubActionsVersionUpdater:
                 "commit_date": response_data["commit"]["author"]["date"],
             }
 
-        gha_utils.notice(
+        self._log(
+            gha_utils.notice,
             f"Could not find commit data for tag/branch {tag_or_branch_name} on "
-            f'"{action_repository}", GitHub API Response: {response.json()}'
+            f'"{action_repository}", GitHub API Response: {response.json()}',
         )
         return {}
 
+    @cache
     def _get_default_branch_name(self, action_repository: str) -> str | None:
         """Get the Action Repository's Default Branch Name using GitHub API"""
         url = f"{self.github_api_url}/repos/{action_repository}"
 
-        response = requests.get(
-            url, headers=get_request_headers(self.user_config.token)
-        )
+        response = self.session.get(url)
 
         if response.status_code == 200:
             return response.json()["default_branch"]
 
-        gha_utils.notice(
+        self._log(
+            gha_utils.notice,
             f"Could not find default branch for "
-            f'"{action_repository}", GitHub API Response: {response.json()}'
+            f'"{action_repository}", GitHub API Response: {response.json()}',
         )
         return None
 
@@ -408,34 +790,38 @@ class GitHubActionsVersionUpdater:
         self, action_repository: str, current_version: str
     ) -> tuple[str | None, dict[str, str]]:
         """Get the new version for the action"""
-        gha_utils.echo(f'Checking "{action_repository}" for updates...')
+        self._log(gha_utils.echo, f'Checking "{action_repository}" for updates...')
 
         if self.user_config.update_version_with == UpdateVersionWith.LATEST_RELEASE_TAG:
-            latest_release_data = self._get_latest_version_release(
+            latest_release = self._get_latest_version_release(
                 action_repository, current_version
             )
-            return latest_release_data.get("tag_name"), latest_release_data
+
+            if latest_release is None:
+                return None, {}
+
+            return latest_release.tag_name, latest_release._asdict()
 
         elif (
             self.user_config.update_version_with
             == UpdateVersionWith.LATEST_RELEASE_COMMIT_SHA
         ):
-            latest_release_data = self._get_latest_version_release(
+            latest_release = self._get_latest_version_release(
                 action_repository, current_version
             )
 
-            if not latest_release_data:
+            if latest_release is None:
                 return None, {}
 
             tag_commit_data = self._get_commit_data(
-                action_repository, latest_release_data["tag_name"]
+                action_repository, latest_release.tag_name
             )
 
             if not tag_commit_data:
                 return None, {}
 
             return tag_commit_data["commit_sha"], {
-                **latest_release_data,
+                **latest_release._asdict(),
                 **tag_commit_data,
             }
 
@@ -465,9 +851,7 @@ class GitHubActionsVersionUpdater:
         """Get all workflows of the repository using GitHub API"""
         url = f"{self.github_api_url}/repos/{self.env.repository}/actions/workflows"
 
-        response = requests.get(
-            url, headers=get_request_headers(self.user_config.token)
-        )
+        response = self.session.get(url)
 
         if response.status_code == 200:
             return {workflow["path"] for workflow in response.json()["workflows"]}
@@ -488,18 +872,136 @@ class GitHubActionsVersionUpdater:
 
         return workflow_paths
 
-    def _get_all_actions(self, data: Any) -> Generator[str, None, None]:
-        """Recursively get all action names from workflow data"""
-        if isinstance(data, dict):
-            for key, value in data.items():
-                if key == self.workflow_action_key:
-                    yield value
-                elif isinstance(value, dict) or isinstance(value, list):
-                    yield from self._get_all_actions(value)
-
-        elif isinstance(data, list):
-            for element in data:
-                yield from self._get_all_actions(element)
+    def _get_all_actions(self, file_data: str) -> set[str]:
+        """Get all action names from the workflow"""
+        if not _COMPLEX_YAML_RE.search(file_data):
+            # Most workflows only use block style YAML,
+            # so the actions can be found without parsing the YAML
+            all_actions = self._get_block_style_actions(file_data)
+
+            if all_actions is not None:
+                return all_actions
+
+        return self._get_parsed_actions(file_data)
+
+    def _get_parsed_actions(self, file_data: str) -> set[str]:
+        """Get all action names from the workflow using the YAML parsing events"""
+        # One item per open collection: `True` if the next node of a
+        # mapping is a key, `False` if it is a value and `None` for sequences
+        collections: list[bool | None] = []
+        is_action_value = False
+        all_actions: set[str] = set()
+        # Values of anchored scalars, used to resolve aliases e.g. `uses: *checkout`
+        anchors: dict[str, str] = {}
+        events = yaml.parse(file_data, Loader=_YAML_LOADER)
+
+        for event in events:
+            if isinstance(event, yaml.CollectionEndEvent):
+                collections.pop()
+                continue
+
+            if not isinstance(event, yaml.NodeEvent):
+                continue
+
+            is_key = bool(collections) and collections[-1] is True
+
+            if collections and collections[-1] is not None:
+                collections[-1] = not collections[-1]
+
+            if isinstance(event, yaml.ScalarEvent):
+                if event.anchor is not None:
+                    anchors[event.anchor] = event.value
+
+                if is_key and len(collections) == 1 and event.value in _NON_ACTION_KEYS:
+                    self._skip_yaml_node(events, anchors)
+                    # The value was skipped, the next node is a key again
+                    collections[-1] = True
+                    is_action_value = False
+                    continue
+
+                if is_action_value:
+                    all_actions.add(event.value)
+
+                is_action_value = is_key and event.value == self.workflow_action_key
+            else:
+                if (
+                    is_action_value
+                    and isinstance(event, yaml.AliasEvent)
+                    and event.anchor in anchors
+                ):
+                    all_actions.add(anchors[event.anchor])
+
+                is_action_value = False
+
+            if isinstance(event, yaml.MappingStartEvent):
+                collections.append(True)
+            elif isinstance(event, yaml.SequenceStartEvent):
+                collections.append(None)
+
+        return all_actions
+
+    def _get_block_style_actions(self, file_data: str) -> set[str] | None:
+        """
+        Get all action names from the `uses:` lines of a block style workflow.
+        Returns `None` if a `uses:` line is inside a block scalar (e.g. a `run`
+        script) or a quoted value spans multiple lines, the workflow needs to
+        be parsed to tell them apart.
+        """
+        all_actions: set[str] = set()
+        # Indentation of the line that started the current block scalar
+        block_scalar_indent: int | None = None
+        top_level_key: str | None = None
+
+        for line in file_data.splitlines():
+            stripped_line = line.lstrip()
+
+            if not stripped_line or stripped_line.startswith("#"):
+                continue
+
+            indent = len(line) - len(stripped_line)
+            action_match = _ACTION_LINE_RE.match(line)
+
+            if block_scalar_indent is not None:
+                if indent > block_scalar_indent:
+                    if action_match:
+                        return None
+                    continue
+
+                block_scalar_indent = None
+
+            if _UNCLOSED_QUOTE_RE.match(line):
+                return None
+
+            if indent == 0:
+                top_level_key = stripped_line.split(":", 1)[0].strip("\"' ")
+
+            # Skip the same top-level keys as the YAML event parser
+            if action_match and top_level_key not in _NON_ACTION_KEYS:
+                all_actions.add(action_match.group(1))
+
+            if _BLOCK_SCALAR_RE.search(line):
+                block_scalar_indent = indent
+
+        return all_actions
+
+    def _skip_yaml_node(
+        self, events: Iterator[yaml.Event], anchors: dict[str, str]
+    ) -> None:
+        """Consume the YAML parsing events of the next node"""
+        depth = 0
+
+        for event in events:
+            if isinstance(event, yaml.ScalarEvent) and event.anchor is not None:
+                # Skipped values can still be used as actions through aliases
+                anchors[event.anchor] = event.value
+
+            if isinstance(event, yaml.CollectionStartEvent):
+                depth += 1
+            elif isinstance(event, yaml.CollectionEndEvent):
+                depth -= 1
+
+            if depth == 0:
+                return
 
 
 if __name__ == "__main__":
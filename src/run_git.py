@@ -41,12 +41,13 @@ def git_commit_changes(
     commit_author: str,
     commit_branch_name: str,
     force_push: bool = False,
+    excluded_paths: tuple[str, ...] = (),
 ) -> None:
     """
     Commit the changed files.
     """
     with gha_utils.group("Commit Changes"):
-        run_subprocess_command(["git", "add", "."])
+        run_subprocess_command(["git", "add", *get_pathspec(excluded_paths)])
         run_subprocess_command(
             ["git", "commit", f"--author={commit_author}", "-m", commit_message]
         )
@@ -59,20 +60,29 @@ def git_commit_changes(
         run_subprocess_command(push_command)
 
 
-def git_has_changes() -> bool:
+def git_has_changes(excluded_paths: tuple[str, ...] = ()) -> bool:
     """
     Check if there are changes to commit.
     """
     try:
-        subprocess.check_output(["git", "diff", "--exit-code"])
+        subprocess.check_output(
+            ["git", "diff", "--exit-code", *get_pathspec(excluded_paths)]
+        )
         return False
     except subprocess.CalledProcessError:
         return True
 
 
-def git_diff() -> str:
+def git_diff(excluded_paths: tuple[str, ...] = ()) -> str:
     """Return the git diff"""
-    return subprocess.run(["git", "diff"], capture_output=True, text=True).stdout
+    return subprocess.run(
+        ["git", "diff", *get_pathspec(excluded_paths)], capture_output=True, text=True
+    ).stdout
+
+
+def get_pathspec(excluded_paths: tuple[str, ...]) -> list[str]:
+    """Return a pathspec matching all files except the excluded paths"""
+    return ["--", ".", *(f":(exclude){path}" for path in excluded_paths)]
 
 
 def run_subprocess_command(command: list[str]) -> None:
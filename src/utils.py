@@ -1,7 +1,16 @@
-from functools import cache
+import json
+import os
+import time
+from collections.abc import Callable
+from email.utils import parsedate_to_datetime
+from functools import cache, partial
+from pathlib import Path
+from typing import Any
 
 import github_action_utils as gha_utils  # type: ignore
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from .run_git import git_diff
 
@@ -17,6 +26,125 @@ def get_request_headers(github_token: str | None = None) -> dict[str, str]:
     return headers
 
 
+def wait_for_rate_limit_reset(
+    response: requests.Response,
+    *args: Any,
+    log: Callable[[str], None] = gha_utils.warning,
+    **kwargs: Any,
+) -> requests.Response:
+    """Wait for the GitHub API rate limit to reset and retry the request"""
+    if response.status_code not in (403, 429):
+        return response
+
+    if response.headers.get("Retry-After"):
+        # Secondary rate limits tell us how long to wait
+        wait_seconds = parse_retry_after(response.headers["Retry-After"])
+
+        if wait_seconds is None:
+            return response
+    elif response.headers.get("X-RateLimit-Remaining") == "0":
+        reset_at = int(response.headers.get("X-RateLimit-Reset", 0))
+        wait_seconds = max(reset_at - int(time.time()), 0) + 1
+    else:
+        return response
+
+    log(f"GitHub API rate limit exceeded, retrying in {wait_seconds} seconds")
+    time.sleep(wait_seconds)
+    # Send using the adapter directly so that this hook is not run again
+    return response.connection.send(response.request, **kwargs)
+
+
+def parse_retry_after(retry_after: str) -> int | None:
+    """Parse the seconds to wait from a `Retry-After` header value"""
+    if retry_after.strip().isdigit():
+        return int(retry_after)
+
+    # `Retry-After` can also be an HTTP-date
+    try:
+        retry_at = parsedate_to_datetime(retry_after)
+    except (TypeError, ValueError):
+        return None
+
+    if retry_at.tzinfo is None:
+        return None
+
+    return max(int(retry_at.timestamp() - time.time()), 0) + 1
+
+
+def create_request_session(
+    github_token: str | None = None,
+    pool_size: int = 10,
+    log_rate_limit: Callable[[str], None] = gha_utils.warning,
+) -> requests.Session:
+    """Create a session for GitHub API requests that reuses connections"""
+    session = requests.Session()
+    session.headers.update(get_request_headers(github_token))
+    session.hooks["response"].append(
+        partial(wait_for_rate_limit_reset, log=log_rate_limit)
+    )
+
+    retry = Retry(
+        total=5,
+        backoff_factor=0.5,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=["GET"],
+        respect_retry_after_header=True,
+        # Return the last response instead of raising an error
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+
+    return session
+
+
+def load_json_cache(cache_file: str) -> dict[str, Any]:
+    """Load cached data from a JSON file"""
+    if not cache_file:
+        return {}
+
+    try:
+        with open(cache_file) as file:
+            data = json.load(file)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as exc:
+        gha_utils.warning(f"Could not load cache from '{cache_file}'. Reason: {exc}")
+        return {}
+
+    if not isinstance(data, dict):
+        gha_utils.warning(
+            f"Could not load cache from '{cache_file}'. "
+            "Reason: Expected a JSON object at the top level"
+        )
+        return {}
+
+    return data
+
+
+def save_json_cache(cache_file: str, data: dict[str, Any]) -> None:
+    """Save cached data to a JSON file"""
+    if not cache_file:
+        return
+
+    # Write to a temporary file first so that an interrupted run
+    # never leaves a partially written cache behind
+    temporary_path = f"{cache_file}.tmp"
+
+    try:
+        Path(cache_file).parent.mkdir(parents=True, exist_ok=True)
+
+        with open(temporary_path, "w") as file:
+            json.dump(data, file)
+
+        os.replace(temporary_path, cache_file)
+    except OSError as exc:
+        gha_utils.warning(f"Could not save cache to '{cache_file}'. Reason: {exc}")
+
+
 def create_pull_request(
     pull_request_title: str,
     repository_name: str,
@@ -140,12 +268,12 @@ def add_pull_request_labels(
         )
 
 
-def add_git_diff_to_job_summary() -> None:
+def add_git_diff_to_job_summary(excluded_paths: tuple[str, ...] = ()) -> None:
     """Add git diff to job summary"""
     markdown_diff = (
         "<details>"
         "<summary>Git Diff</summary>"
-        f"\n\n```diff\n{git_diff()}```\n\n"
+        f"\n\n```diff\n{git_diff(excluded_paths)}```\n\n"
         "</details>"
     )
     gha_utils.append_job_summary(markdown_diff)
@@ -0,0 +1,212 @@
+import pytest
+
+from src.main import _COMPLEX_YAML_RE, GitHubActionsVersionUpdater
+
+WORKFLOWS = [
+    (
+        "simple",
+        """
+jobs:
+  test:
+    steps:
+      - uses: actions/checkout@v4
+      - uses: actions/setup-python@v5
+""",
+        {"actions/checkout@v4", "actions/setup-python@v5"},
+    ),
+    (
+        "quoted_values",
+        """
+jobs:
+  test:
+    steps:
+      - uses: "actions/checkout@v4"
+      - uses: 'actions/setup-python@v5'
+""",
+        {"actions/checkout@v4", "actions/setup-python@v5"},
+    ),
+    (
+        "trailing_comment",
+        """
+jobs:
+  test:
+    steps:
+      - uses: actions/checkout@v4 # pinned
+""",
+        {"actions/checkout@v4"},
+    ),
+    (
+        "commented_out",
+        """
+jobs:
+  test:
+    steps:
+      # - uses: actions/cache@v3
+      - uses: actions/checkout@v4
+""",
+        {"actions/checkout@v4"},
+    ),
+    (
+        "reusable_workflow",
+        """
+jobs:
+  call:
+    uses: octo-org/repo/.github/workflows/ci.yaml@v1
+""",
+        {"octo-org/repo/.github/workflows/ci.yaml@v1"},
+    ),
+    (
+        "docker_and_local",
+        """
+jobs:
+  test:
+    steps:
+      - uses: docker://alpine:3.8
+      - uses: ./.github/actions/local
+""",
+        {"docker://alpine:3.8", "./.github/actions/local"},
+    ),
+    (
+        "composite_action",
+        """
+name: Composite
+description: 'uses: fake/x@v1'
+runs:
+  using: composite
+  steps:
+    - uses: actions/checkout@v4
+""",
+        {"actions/checkout@v4"},
+    ),
+    (
+        "non_action_keys",
+        """
+env:
+  uses: fake/x@v1
+jobs:
+  test:
+    steps:
+      - uses: actions/checkout@v4
+""",
+        {"actions/checkout@v4"},
+    ),
+    (
+        "literal_block_scalar",
+        """
+jobs:
+  test:
+    steps:
+      - run: |
+          cat <<EOF
+          uses: fake/x@v1
+          EOF
+      - uses: actions/checkout@v4
+""",
+        {"actions/checkout@v4"},
+    ),
+    (
+        "folded_block_scalar",
+        """
+jobs:
+  test:
+    steps:
+      - run: >-
+          echo
+          uses: fake/x@v1
+""",
+        set(),
+    ),
+    (
+        "double_quoted_multiline",
+        """
+jobs:
+  test:
+    steps:
+      - run: "echo hi
+          uses: fake/y@v1"
+      - uses: actions/checkout@v4
+""",
+        {"actions/checkout@v4"},
+    ),
+    (
+        "single_quoted_multiline",
+        """
+jobs:
+  test:
+    steps:
+      - name: 'it''s
+          uses: fake/z@v1'
+        uses: actions/checkout@v4
+""",
+        {"actions/checkout@v4"},
+    ),
+    (
+        "quoted_on_one_line",
+        """
+jobs:
+  test:
+    steps:
+      - run: "echo \\"hi\\""
+      - name: 'it''s fine'
+        uses: actions/checkout@v4
+""",
+        {"actions/checkout@v4"},
+    ),
+    (
+        "value_on_next_line",
+        """
+jobs:
+  test:
+    steps:
+      - uses:
+          actions/checkout@v4
+""",
+        {"actions/checkout@v4"},
+    ),
+    (
+        "flow_mapping",
+        """
+jobs:
+  test:
+    steps:
+      - {name: Checkout, uses: actions/checkout@v4}
+""",
+        {"actions/checkout@v4"},
+    ),
+    (
+        "anchor_and_alias",
+        """
+jobs:
+  test:
+    steps:
+      - uses: &checkout actions/checkout@v4
+  build:
+    steps:
+      - uses: *checkout
+      - uses: actions/cache@v4
+""",
+        {"actions/checkout@v4", "actions/cache@v4"},
+    ),
+]
+
+
+@pytest.fixture
+def updater():
+    # Action discovery does not use any configuration
+    return GitHubActionsVersionUpdater.__new__(GitHubActionsVersionUpdater)
+
+
+@pytest.mark.parametrize(
+    "file_data, expected_actions",
+    [pytest.param(data, expected, id=name) for name, data, expected in WORKFLOWS],
+)
+def test_get_all_actions(updater, file_data, expected_actions):
+    assert updater._get_all_actions(file_data) == expected_actions
+    assert updater._get_parsed_actions(file_data) == expected_actions
+
+    # The line scanner is only used for workflows without complex YAML
+    if not _COMPLEX_YAML_RE.search(file_data):
+        block_style_actions = updater._get_block_style_actions(file_data)
+
+        if block_style_actions is not None:
+            assert block_style_actions == expected_actions